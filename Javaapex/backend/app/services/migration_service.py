@@ -0,0 +1,474 @@
+"""Service for previewing and applying Java source migrations.
+
+Handles the source-level rewrites behind the migration preview endpoint:
+javax -> jakarta namespace moves, JUnit 4 -> 5, and Spring Boot 2 -> 3.
+"""
+
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Any, Dict, List
+
+try:  # optional accelerator: single-pass multi-literal matching
+    import ahocorasick
+except ImportError:  # pragma: no cover - union regex fallback is used instead
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# Build-output directories pruned from every source walk.
+_SKIP_DIRS = frozenset(("target", "build", "out"))
+
+# Target version written into pom.xml when upgrading Spring Boot 2.x projects.
+_SPRING_BOOT_TARGET_VERSION = "3.2.0"
+
+# Single combined pattern covering both places a Spring Boot 2.x version can
+# live in a pom.xml: the <spring-boot.version> property and the parent POM
+# <version> element.  One subn() pass replaces both, instead of running two
+# separate re.sub passes over the same buffer.
+_SPRING_BOOT_COMBINED = re.compile(
+    r"(<spring-boot\.version>)2\.[^<]+(</spring-boot\.version>)"
+    r"|(<parent>.*?<version>)2\.[^<]+(</version>.*?</parent>)",
+    re.DOTALL,
+)
+
+
+def _spring_boot_version_replacement(match: "re.Match[str]") -> str:
+    """Dispatch on which alternation branch matched and splice in the target version."""
+    if match.group(1) is not None:
+        return f"{match.group(1)}{_SPRING_BOOT_TARGET_VERSION}{match.group(2)}"
+    return f"{match.group(3)}{_SPRING_BOOT_TARGET_VERSION}{match.group(4)}"
+
+
+# Raw conversion patterns, keyed by conversion type.  Each entry is
+# (pattern, replacement, description); MigrationService compiles them once at
+# construction so the per-file preview loop never touches the re-module cache.
+_RAW_PATTERNS_BY_TYPE = {
+    "javax_to_jakarta": [
+        (
+            r"import\s+javax\.servlet",
+            "import jakarta.servlet",
+            "Migrate javax.servlet imports to jakarta.servlet",
+        ),
+        (
+            r"import\s+javax\.persistence",
+            "import jakarta.persistence",
+            "Migrate javax.persistence imports to jakarta.persistence",
+        ),
+        (
+            r"import\s+javax\.validation",
+            "import jakarta.validation",
+            "Migrate javax.validation imports to jakarta.validation",
+        ),
+        (
+            r"import\s+javax\.annotation",
+            "import jakarta.annotation",
+            "Migrate javax.annotation imports to jakarta.annotation",
+        ),
+    ],
+    "junit4_to_junit5": [
+        (
+            r"import\s+org\.junit\.Test\b",
+            "import org.junit.jupiter.api.Test",
+            "Migrate JUnit 4 @Test import to JUnit 5",
+        ),
+        (
+            r"import\s+org\.junit\.Assert",
+            "import org.junit.jupiter.api.Assertions",
+            "Migrate JUnit 4 assertions to JUnit 5",
+        ),
+        (
+            r"@Before\b",
+            "@BeforeEach",
+            "Replace JUnit 4 @Before with @BeforeEach",
+        ),
+        (
+            r"@After\b",
+            "@AfterEach",
+            "Replace JUnit 4 @After with @AfterEach",
+        ),
+    ],
+    "spring_boot_2_to_3": [
+        (
+            r"WebSecurityConfigurerAdapter",
+            "SecurityFilterChain",
+            "Replace removed WebSecurityConfigurerAdapter with SecurityFilterChain bean",
+        ),
+        (
+            r"@EnableGlobalMethodSecurity",
+            "@EnableMethodSecurity",
+            "Replace @EnableGlobalMethodSecurity with @EnableMethodSecurity",
+        ),
+        (
+            r"\.antMatchers\(",
+            ".requestMatchers(",
+            "Replace antMatchers() with requestMatchers()",
+        ),
+    ],
+}
+
+
+def _derive_literal_anchor(pattern: str) -> str:
+    """Longest plain-text run in a regex, used as a cheap substring gate.
+
+    Escaped punctuation counts as a literal character; any other
+    metacharacter ends the current run.  Returns "" when the pattern has no
+    usable literal.
+    """
+    runs = [""]
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            nxt = pattern[i + 1] if i + 1 < len(pattern) else ""
+            if nxt in ".@{}()[]+*?|^$\\":
+                runs[-1] += nxt
+            else:
+                # character-class escape such as \s or \b breaks the run
+                runs.append("")
+            i += 2
+            continue
+        if c in ".^$*+?{}[]()|":
+            runs.append("")
+            i += 1
+            continue
+        runs[-1] += c
+        i += 1
+    return max(runs, key=len)
+
+
+# Immutable compiled-pattern table shared by every MigrationService instance:
+# conversion type -> tuple of (compiled, anchor, pattern, replacement,
+# description).  Patterns are ASCII-only, so they are compiled as bytes and
+# files are scanned in binary -- that skips the UTF-8 decode pass entirely and
+# lets re release the GIL during matching.  The raw pattern string is kept
+# alongside the compiled object because the preview output reports it.
+PATTERN_TABLE = {
+    conversion_type: tuple(
+        (
+            re.compile(pattern.encode("ascii")),
+            _derive_literal_anchor(pattern).encode("ascii"),
+            pattern,
+            replacement,
+            description,
+        )
+        for pattern, replacement, description in entries
+    )
+    for conversion_type, entries in _RAW_PATTERNS_BY_TYPE.items()
+}
+
+# Union/automaton prefilters, keyed by the requested conversion-type tuple;
+# shared across calls and instances.
+_UNION_CACHE = {}
+
+
+def _iter_java_files(root: str):
+    """Yield paths of ``.java`` files under *root* using an iterative scandir walk.
+
+    scandir exposes the file type from the directory read itself, so no extra
+    stat call is paid per entry.  Hidden directories and Maven/Gradle output
+    directories are pruned at the dirent level.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                # name[:1] sidesteps the bound-method call of startswith, and
+                # frozenset membership beats a small-list scan.
+                if name[:1] == ".":
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in _SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif name.endswith(".java") and entry.is_file(follow_symlinks=False):
+                        yield entry.path
+                except OSError:
+                    continue
+
+
+_KNOWN_UPGRADES = {
+    "org.springframework.boot": {
+        "target_version": "3.2.0",
+        "reason": "Spring Boot 2.x is out of OSS support",
+    },
+    "junit:junit": {
+        "target_version": "5.10.1",
+        "reason": "JUnit 4 superseded by JUnit 5 (Jupiter)",
+    },
+    "javax.servlet:javax.servlet-api": {
+        "target_version": "6.0.0",
+        "reason": "javax.servlet moved to jakarta.servlet",
+    },
+    "log4j:log4j": {
+        "target_version": "2.22.0",
+        "reason": "Log4j 1.x is EOL and has known CVEs",
+    },
+}
+
+
+@lru_cache(maxsize=4096)
+def _lookup_upgrade(group_id: str, artifact_id: str, current_version: str):
+    """Resolve the upgrade recommendation for one coordinate.
+
+    Multi-module Maven projects redeclare the same dependency many times, so
+    repeat lookups are the common case and hit the cache.
+    """
+    key = f"{group_id}:{artifact_id}"
+    if key in _KNOWN_UPGRADES:
+        return _KNOWN_UPGRADES[key]
+    if group_id in _KNOWN_UPGRADES:
+        return _KNOWN_UPGRADES[group_id]
+    return None
+
+
+class MigrationService:
+    """Previews and applies automated Java migration changes."""
+
+    def __init__(self):
+        self.supported_conversions = [
+            "javax_to_jakarta",
+            "junit4_to_junit5",
+            "spring_boot_2_to_3",
+        ]
+
+    async def preview_migration(
+        self,
+        project_dir: str,
+        conversion_types: List[str],
+        dependencies: List[Dict[str, Any]] = None,
+        count_occurrences: bool = False,
+    ) -> Dict[str, Any]:
+        """Build a preview of every change a migration run would make.
+
+        With count_occurrences False (the default) each file reports only
+        which conversion first applies, stopping at the first hit; pass True
+        for exact per-pattern match counts.
+        """
+        preview = {
+            "files_to_modify": [],
+            "dependency_changes": [],
+            "conversion_types": conversion_types,
+        }
+
+        src_dir = os.path.join(project_dir, "src")
+        if os.path.isdir(src_dir):
+            preview["files_to_modify"] = self._preview_conversion_changes(
+                src_dir, conversion_types, count_occurrences
+            )
+
+        if dependencies:
+            preview["dependency_changes"] = self._preview_dependency_changes(dependencies)
+
+        return preview
+
+    def _preview_conversion_changes(
+        self, src_dir: str, conversion_types: List[str], count_occurrences: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Scan Java sources and report which files each conversion would touch."""
+        patterns = tuple(
+            chain.from_iterable(
+                PATTERN_TABLE.get(conversion_type, ())
+                for conversion_type in conversion_types
+            )
+        )
+        if not patterns:
+            return []
+
+        # Most files in a large repo match none of the patterns.  An
+        # Aho-Corasick automaton over the literal anchors finds every
+        # candidate pattern in one pass; without pyahocorasick, a single
+        # union alternation at least proves absence in one scan.
+        key = tuple(conversion_types)
+        cached = _UNION_CACHE.get(key)
+        if cached is None:
+            union = re.compile(
+                "|".join(f"(?:{p})" for _, _, p, _, _ in patterns).encode("ascii")
+            )
+            automaton = None
+            if ahocorasick is not None:
+                by_anchor = {}
+                for idx, (_, anchor, _, _, _) in enumerate(patterns):
+                    by_anchor.setdefault(anchor.decode("ascii"), []).append(idx)
+                if "" not in by_anchor:
+                    automaton = ahocorasick.Automaton()
+                    for word, indices in by_anchor.items():
+                        automaton.add_word(word, tuple(indices))
+                    automaton.make_automaton()
+            cached = (union, automaton)
+            _UNION_CACHE[key] = cached
+        union, automaton = cached
+
+        # Each file is an independent read + regex scan; re releases the GIL
+        # during C-level matching, so threads overlap regex CPU with disk I/O.
+        paths = list(_iter_java_files(src_dir))
+        # scandir already yields absolute entry paths rooted at src_dir, so
+        # the relative path is a fixed-offset slice -- no relpath
+        # normalization per file.
+        src_prefix_len = len(src_dir.rstrip(os.sep)) + 1
+        changes = []
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            scan = partial(
+                self._scan_file,
+                patterns=patterns,
+                union=union,
+                automaton=automaton,
+                count_occurrences=count_occurrences,
+            )
+            for filepath, file_changes in zip(paths, pool.map(scan, paths)):
+                if file_changes:
+                    changes.append(
+                        {
+                            "file": filepath[src_prefix_len:],
+                            "changes": file_changes,
+                        }
+                    )
+
+        return changes
+
+    def _scan_file(
+        self, filepath, patterns, union, automaton=None, count_occurrences=False
+    ):
+        """Scan one Java file and return its change records (or None).
+
+        The file is mapped instead of read: re accepts any bytes-like object,
+        so patterns run directly against the kernel page cache without an
+        O(file size) copy into a Python buffer.
+        """
+        try:
+            with open(filepath, "rb") as f:
+                try:
+                    content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # zero-length files cannot be mapped (and match nothing)
+                    return None
+        except OSError:
+            logger.warning("Could not read %s", filepath)
+            return None
+
+        with content:
+            return self._scan_buffer(
+                content, patterns, union, automaton, count_occurrences
+            )
+
+    def _scan_buffer(self, content, patterns, union, automaton, count_occurrences):
+        """Run the pattern set over one bytes-like buffer."""
+        if automaton is not None:
+            # One automaton pass over the text collects every pattern whose
+            # anchor occurs, replacing P separate substring scans.  latin-1 is
+            # a byte-transparent 1:1 decode.
+            candidates = set()
+            total = len(patterns)
+            for _, indices in automaton.iter(content[:].decode("latin-1")):
+                candidates.update(indices)
+                if len(candidates) == total:
+                    break
+            if not candidates:
+                return None
+            candidate_indices = sorted(candidates)
+        else:
+            if not union.search(content):
+                return None
+            candidate_indices = [
+                idx
+                for idx, (_, anchor, _, _, _) in enumerate(patterns)
+                # a C-level substring find is far cheaper than invoking the
+                # regex engine just to prove a pattern is absent (mmap does
+                # not support the in operator, so use find)
+                if not anchor or content.find(anchor) >= 0
+            ]
+
+        file_changes = []
+        for idx in candidate_indices:
+            compiled, anchor, pattern, replacement, description = patterns[idx]
+            if count_occurrences:
+                # A single findall both tests presence and counts matches;
+                # a separate search() first would scan the content twice.
+                occurrences = len(compiled.findall(content))
+            else:
+                # Presence is all the caller needs: a search() stops at the
+                # first hit instead of walking the whole buffer.
+                occurrences = 1 if compiled.search(content) else 0
+            if occurrences:
+                file_changes.append(
+                    {
+                        "pattern": pattern,
+                        "replacement": replacement,
+                        "description": description,
+                        "occurrences": occurrences,
+                    }
+                )
+                if not count_occurrences:
+                    # File is already marked for modification; no need to
+                    # prove further patterns also match.
+                    break
+
+        return file_changes
+
+    def _preview_dependency_changes(
+        self, dependencies: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Report the upgrades that would be applied to each declared dependency."""
+        dependency_changes = []
+        for dep in dependencies:
+            group_id = dep.get("group_id", "")
+            artifact_id = dep.get("artifact_id", "")
+            current_version = dep.get("current_version", "")
+            upgrade = self._get_upgrade_info(group_id, artifact_id, current_version)
+            if upgrade:
+                dependency_changes.append(
+                    {
+                        "group_id": group_id,
+                        "artifact_id": artifact_id,
+                        "current_version": current_version,
+                        "target_version": upgrade["target_version"],
+                        "reason": upgrade["reason"],
+                    }
+                )
+        return dependency_changes
+
+    def _get_upgrade_info(
+        self, group_id: str, artifact_id: str, current_version: str
+    ) -> Dict[str, str]:
+        """Look up the recommended upgrade for a Maven coordinate, if any."""
+        return _lookup_upgrade(group_id, artifact_id, current_version)
+
+    def _convert_spring_boot_2_to_3(self, project_dir: str) -> List[str]:
+        """Rewrite Spring Boot 2.x version pins and properties to Spring Boot 3."""
+        modified_files = []
+
+        pom_path = os.path.join(project_dir, "pom.xml")
+        if os.path.exists(pom_path):
+            with open(pom_path, "r", encoding="utf-8") as f:
+                content = f.read()
+            new_content, count = _SPRING_BOOT_COMBINED.subn(
+                _spring_boot_version_replacement, content
+            )
+            if count:
+                with open(pom_path, "w", encoding="utf-8") as f:
+                    f.write(new_content)
+                modified_files.append("pom.xml")
+                logger.info("Updated %d Spring Boot version pin(s) in pom.xml", count)
+
+        props_path = os.path.join(
+            project_dir, "src", "main", "resources", "application.properties"
+        )
+        if os.path.exists(props_path):
+            with open(props_path, "r", encoding="utf-8") as f:
+                content = f.read()
+            new_content = content.replace("spring.redis.", "spring.data.redis.")
+            if new_content != content:
+                with open(props_path, "w", encoding="utf-8") as f:
+                    f.write(new_content)
+                modified_files.append("src/main/resources/application.properties")
+
+        return modified_files
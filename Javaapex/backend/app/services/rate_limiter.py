@@ -0,0 +1,198 @@
+"""Rate-limit tracking and retry helpers for GitHub API access.
+
+Keeps per-endpoint rate-limit state fed from response headers, and provides
+retry/backoff primitives used by the GitHub service wrappers.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from github import GithubException, RateLimitExceededException
+except ImportError:  # pragma: no cover - PyGithub is an optional caller dep
+    GithubException = None
+    RateLimitExceededException = None
+
+logger = logging.getLogger(__name__)
+
+# Bound once; saves the module-dict attribute lookup on every delay draw.
+_rand = random.random
+
+
+class RateLimitTracker:
+    """Tracks GitHub rate-limit state per endpoint category.
+
+    Updated from the X-RateLimit-* headers of each API response; queried on
+    every request path, so bookkeeping here must stay cheap.  A plain Lock is
+    used -- no method re-enters the lock, so the owner/recursion tracking an
+    RLock pays for would be wasted.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.limits: Dict[str, Dict[str, Any]] = {}
+
+    def update_from_response(self, endpoint: str, headers: Dict[str, str]) -> None:
+        """Record the rate-limit headers from an API response."""
+        try:
+            limit = int(headers.get("X-RateLimit-Limit", 0))
+            remaining = int(headers.get("X-RateLimit-Remaining", 0))
+            reset = int(headers.get("X-RateLimit-Reset", 0))
+        except (TypeError, ValueError):
+            return
+        # Convert the epoch reset once into a monotonic deadline, so waits are
+        # immune to wall-clock jumps/NTP slew and get_wait_time avoids the
+        # wall-clock syscall.
+        reset_monotonic = time.monotonic() + max(0.0, reset - time.time())
+        with self.lock:
+            self.limits[endpoint] = {
+                "limit": limit,
+                "remaining": remaining,
+                "reset": reset,
+                "reset_monotonic": reset_monotonic,
+            }
+
+    def get_status(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Return the last recorded status for an endpoint, if any."""
+        with self.lock:
+            status = self.limits.get(endpoint)
+            return dict(status) if status else None
+
+    def get_wait_time(self, endpoint: str) -> float:
+        """Seconds to wait until the endpoint's window resets (0 if not limited)."""
+        with self.lock:
+            status = self.limits.get(endpoint)
+            if not status or status["remaining"] > 0:
+                return 0.0
+            return max(0.0, status["reset_monotonic"] - time.monotonic())
+
+    def is_rate_limited(self, endpoint: str) -> bool:
+        """True when the endpoint has exhausted its current window."""
+        with self.lock:
+            status = self.limits.get(endpoint)
+            return bool(status) and status["remaining"] <= 0
+
+    def get_all_statuses(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every tracked endpoint's status."""
+        with self.lock:
+            return {endpoint: dict(status) for endpoint, status in self.limits.items()}
+
+
+@functools.lru_cache(maxsize=128)
+def _fmt_reset(reset_epoch: int) -> str:
+    """Format a reset timestamp; cached because it only changes once per window."""
+    return datetime.fromtimestamp(reset_epoch).strftime("%H:%M:%S")
+
+
+def format_rate_limit_status(tracker: RateLimitTracker) -> str:
+    """Human-readable one-liner per tracked endpoint, for logs and debug output."""
+    statuses = tracker.get_all_statuses()
+    if not statuses:
+        return "No rate limit data recorded yet"
+    lines = []
+    for endpoint, status in statuses.items():
+        reset_at = _fmt_reset(status["reset"])
+        lines.append(
+            f"{endpoint}: {status['remaining']}/{status['limit']} remaining, "
+            f"resets at {reset_at}"
+        )
+    return "\n".join(lines)
+
+
+def _is_rate_limit_error(exc: Exception) -> bool:
+    """Classify an exception as a rate-limit error.
+
+    PyGithub raises typed exceptions carrying the HTTP status, so the common
+    case is a single isinstance plus int compare; the lowered-message
+    substring scan only runs for exception classes we do not know.
+    """
+    if RateLimitExceededException is not None:
+        if isinstance(exc, RateLimitExceededException):
+            return True
+        if isinstance(exc, GithubException):
+            return exc.status in (403, 429)
+    error_str = str(exc).lower()
+    return "rate limit" in error_str or "403" in error_str or "abuse" in error_str
+
+
+class ExponentialBackoffRetry:
+    """Computes jittered exponential backoff delays for retry loops."""
+
+    def __init__(self, max_retries: int = 3, initial_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, attempt: int) -> float:
+        """Delay before the given (0-based) retry attempt, with 20% jitter."""
+        delay = min(self.max_delay, self.initial_delay * (2 ** attempt))
+        return delay + delay * 0.2 * _rand()
+
+
+class RequestQueue:
+    """Gates GitHub API calls while rate limited, without blocking the loop.
+
+    Calls are awaited directly under a semaphore instead of being funneled
+    through a single-consumer queue, and the (blocking) callable runs on the
+    default executor so the event loop stays free.  Authenticated clients get
+    more concurrency than anonymous ones.
+    """
+
+    def __init__(self, tracker: RateLimitTracker, authenticated: bool = True):
+        self.tracker = tracker
+        self._sem = asyncio.Semaphore(10 if authenticated else 1)
+
+    async def add_request(self, endpoint: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a call once the rate-limit window and concurrency gate allow it."""
+        async with self._sem:
+            wait_time = self.tracker.get_wait_time(endpoint)
+            if wait_time > 0:
+                logger.warning(
+                    "[RATE_LIMIT] %s: waiting %.1fs before request",
+                    endpoint,
+                    wait_time,
+                )
+                await asyncio.sleep(wait_time)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, functools.partial(func, *args, **kwargs)
+            )
+
+
+def with_rate_limit_handling(
+    tracker: RateLimitTracker, endpoint: str, retry: Optional[ExponentialBackoffRetry] = None
+):
+    """Decorator adding rate-limit detection and backoff retries to a callable."""
+    retry = retry or ExponentialBackoffRetry()
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(retry.max_retries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as exc:
+                    if not _is_rate_limit_error(exc) or attempt >= retry.max_retries:
+                        raise
+                    wait_time = max(tracker.get_wait_time(endpoint), retry.get_delay(attempt))
+                    # %-style args defer string formatting into the logging
+                    # internals, so a disabled level costs nothing per attempt
+                    logger.info(
+                        "[RATE_LIMIT] %s: Rate limited. Waiting %.1fs (attempt %d/%d)",
+                        func.__name__,
+                        wait_time,
+                        attempt + 1,
+                        retry.max_retries,
+                    )
+                    time.sleep(wait_time)
+            return None
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,582 @@
+"""Static analysis of checked-out Java repositories.
+
+Produces the migration-readiness report: dependency health from pom.xml /
+build.gradle, business-logic smells, test coverage signals, and refactoring
+candidates.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import heapq
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional accelerator
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+_SKIP_DIRS = frozenset(("target", "build", "out", "node_modules"))
+_SEVERITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+# One anchored filename pattern classifies test files during the walk; it
+# replaces the chain of endswith/startswith checks per .java entry.
+_TEST_FN = re.compile(r"(?:Test.*|.*Test|.*Tests|.*TestCase)\.java$")
+
+# Every pattern used in the per-file loops, compiled once at import; the loops
+# run them thousands of times per analysis and should not pay the re-module
+# cache lookup per call.
+_RE_GRADLE_JAVA_VERSION = re.compile(r"sourceCompatibility\s*=\s*['\"]?(\d+(?:\.\d+)?)")
+_RE_GRADLE_DEP = re.compile(
+    r"(?:implementation|api|compile|testImplementation)\s*"
+    r"['\"]([\w.\-]+):([\w.\-]+):([\w.\-]+)['\"]"
+)
+# The per-file workers scan bytes straight out of an mmap, so their patterns
+# are compiled in the bytes flavor; Java source is mostly ASCII and skipping
+# the UTF-8 decode halves the scan phase's memory traffic.
+_RE_DEPRECATED = re.compile(rb"@Deprecated")
+_RE_PUBLIC_METHOD = re.compile(rb"public\s+(?:static\s+)?[\w<>\[\]]+\s+\w+\s*\(")
+_RE_NEWLINE = re.compile(rb"\n")
+
+# Business-logic smell patterns, fused into one named-group alternation so a
+# single finditer pass per file replaces six separate content scans; the match
+# dispatches on lastgroup.
+_BL_RAW = {
+    "null_check": r"if\s*\(\s*\w+\s*==\s*null\s*\)",
+    "string_ref_comparison": r"\w+\s*==\s*\"[^\"]*\"",
+    "broad_catch": r"catch\s*\(\s*(?:Exception|Throwable)\s+\w+\s*\)",
+    "empty_catch": r"catch\s*\([^)]*\)\s*\{\s*\}",
+    "system_out": r"System\.out\.print",
+    "thread_sleep": r"Thread\.sleep\s*\(",
+}
+_BL_COMBINED = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _BL_RAW.items()).encode(
+        "latin-1"
+    )
+)
+# finditer yields non-overlapping matches in branch order, so a broad catch
+# with an empty body would match broad_catch and swallow the empty_catch
+# branch; a cheap anchored look at what follows restores that finding.
+_RE_EMPTY_AFTER_CATCH = re.compile(rb"\s*\{\s*\}")
+
+# Severity/suggestion metadata per smell, keyed by the alternation's group
+# names.  Built once at import as plain tuples -- rebuilding a nested dict on
+# every analyzer call added up in a long-running service.
+_BL_META: Dict[str, Tuple[str, str]] = {
+    "null_check": ("LOW", "Consider Optional to make absence explicit"),
+    "string_ref_comparison": ("HIGH", "Compare strings with equals(), not =="),
+    "broad_catch": ("MEDIUM", "Catch the most specific exception type possible"),
+    "empty_catch": ("HIGH", "Handle or log the exception instead of swallowing it"),
+    "system_out": ("LOW", "Use a logging framework instead of System.out"),
+    "thread_sleep": ("MEDIUM", "Avoid fixed sleeps; synchronize on the actual condition"),
+}
+
+_REFACTOR_SUGGESTIONS: Dict[str, str] = {
+    "deprecated_api": "Replace deprecated APIs before migrating",
+    "god_class": "Split this class; it exposes too many methods",
+    "long_method": "Extract smaller methods",
+}
+
+# The framework markers are pure literals: the canonical import line always
+# contains e.g. "org.junit" verbatim, so no regex is needed at all.
+_FRAMEWORK_LITERALS = (
+    ("org.junit", "JUnit"),
+    ("org.testng", "TestNG"),
+    ("org.mockito", "Mockito"),
+)
+
+# When pyahocorasick is installed, one automaton pass finds every literal;
+# the stdlib fallback is a plain substring test per framework.
+if ahocorasick is not None:
+    _FRAMEWORK_AUTOMATON = ahocorasick.Automaton()
+    for _literal, _name in _FRAMEWORK_LITERALS:
+        _FRAMEWORK_AUTOMATON.add_word(_literal, _name)
+    _FRAMEWORK_AUTOMATON.make_automaton()
+else:
+    _FRAMEWORK_AUTOMATON = None
+# Only the method *signature* is matched by regex; the body is walked by the
+# brace scanner below.  Matching whole bodies with "\{[^}]+\}" both missed any
+# method containing a nested block and could backtrack quadratically.
+_RE_METHOD_SIG = re.compile(
+    rb"(?:public|private|protected)\s+(?:static\s+)?"
+    rb"\w[\w<>\[\],\s]*\s+\w+\s*\([^)]*\)\s*\{"
+)
+
+# Per-file scan workers live at module level so the analyzer methods can fan
+# them out over a pool; each worker is self-contained (read + scan) and
+# returns plain dicts for the caller to merge.
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def _method_body_end(buf, start: int) -> int:
+    """Return the offset just past the brace that closes a method body.
+
+    start points past the opening brace.  Walks matching braces with paired
+    find() calls, so the scan is linear in the body length and never enters
+    regex backtracking.  Returns -1 for unbalanced input.
+    """
+    depth = 1
+    pos = start
+    while depth:
+        next_close = buf.find(b"}", pos)
+        if next_close == -1:
+            return -1
+        next_open = buf.find(b"{", pos)
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            pos = next_open + 1
+        else:
+            depth -= 1
+            pos = next_close + 1
+    return pos
+
+
+def _count_token(buf, token: bytes, limit: int) -> int:
+    """Count occurrences of a literal token, stopping once limit is reached.
+
+    mmap has no count(); a find() loop stays in C and lets the threshold
+    gates below bail out as soon as the answer is decided.
+    """
+    count = 0
+    pos = buf.find(token)
+    while pos != -1:
+        count += 1
+        if count >= limit:
+            return count
+        pos = buf.find(token, pos + 1)
+    return count
+
+
+def _mmap_file(java_file: str) -> Optional[mmap.mmap]:
+    """Map a file read-only; None when unreadable or empty (mmap rejects 0)."""
+    try:
+        with open(java_file, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def _scan_business_logic_file(java_file: str, prefix_len: int) -> List[Dict[str, Any]]:
+    """Scan one Java file for business-logic smells; returns raw hits."""
+    content = _mmap_file(java_file)
+    if content is None:
+        return []
+
+    with content:
+        # One newline-offset index per file turns line-number lookup into a
+        # bisect instead of an O(position) slice-and-count per match.
+        newline_offsets = [m.start() for m in _RE_NEWLINE.finditer(content)]
+        hits: List[Dict[str, Any]] = []
+        for match in _BL_COMBINED.finditer(content):
+            line = bisect.bisect_left(newline_offsets, match.start()) + 1
+            hits.append(
+                {
+                    "type": match.lastgroup,
+                    "file": java_file[prefix_len:],
+                    "line": line,
+                    # Only the short snippet is ever decoded.
+                    "snippet": match.group(0)[:100].decode("utf-8", "replace"),
+                }
+            )
+            if match.lastgroup == "broad_catch":
+                empty = _RE_EMPTY_AFTER_CATCH.match(content, match.end())
+                if empty is not None:
+                    hits.append(
+                        {
+                            "type": "empty_catch",
+                            "file": java_file[prefix_len:],
+                            "line": line,
+                            "snippet": content[match.start() : empty.end()][
+                                :100
+                            ].decode("utf-8", "replace"),
+                        }
+                    )
+    return hits
+
+
+def _scan_refactoring_file(java_file: str, prefix_len: int) -> List[Dict[str, Any]]:
+    """Scan one Java file for refactoring candidates."""
+    content = _mmap_file(java_file)
+    if content is None:
+        return []
+
+    rel_path = java_file[prefix_len:]
+    issues: List[Dict[str, Any]] = []
+
+    deprecated = len(_RE_DEPRECATED.findall(content))
+    if deprecated:
+        issues.append(
+            {
+                "type": "deprecated_api",
+                "file": rel_path,
+                "count": deprecated,
+                "suggestion": _REFACTOR_SUGGESTIONS["deprecated_api"],
+            }
+        )
+
+    # A literal "public " count gates the signature regex: most files sit far
+    # below the god-class threshold and never pay for the precise pass.
+    if _count_token(content, b"public ", 21) > 20:
+        public_methods = len(_RE_PUBLIC_METHOD.findall(content))
+        if public_methods > 20:
+            issues.append(
+                {
+                    "type": "god_class",
+                    "file": rel_path,
+                    "count": public_methods,
+                    "suggestion": _REFACTOR_SUGGESTIONS["god_class"],
+                }
+            )
+
+    # Likewise, a method over 50 lines needs a file over 100; skip the DOTALL
+    # method regex on anything shorter.
+    if _count_token(content, b"\n", 101) <= 100:
+        content.close()
+        return issues
+
+    for match in _RE_METHOD_SIG.finditer(content):
+        body_end = _method_body_end(content, match.end())
+        if body_end == -1:
+            continue
+        if content[match.end() : body_end].count(b"\n") > 50:
+            issues.append(
+                {
+                    "type": "long_method",
+                    "file": rel_path,
+                    "line": content[: match.start()].count(b"\n") + 1,
+                    "suggestion": _REFACTOR_SUGGESTIONS["long_method"],
+                }
+            )
+
+    content.close()
+    return issues
+
+
+# Completed analyses keyed on (repo_path, content fingerprint); re-analyzing
+# an unchanged checkout -- the common case when a dashboard polls -- returns
+# the stored report without touching the tree again.
+_ANALYSIS_CACHE: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_ANALYSIS_CACHE_MAX = 8
+
+
+def _repo_fingerprint(repo_path: str, files: Dict[str, List[str]]) -> str:
+    """Cheap content fingerprint for a checkout.
+
+    Hashes (path, mtime, size) of every bucketed file, which changes
+    whenever anything the analyzers read changes.  The HEAD sha is no
+    shortcut here: the migration service rewrites sources in place
+    without committing, so a dirty worktree under an unchanged HEAD is
+    the primary re-analysis flow and must not hit the cache.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for bucket in ("java", "pom", "gradle"):
+        for path in sorted(files[bucket]):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+# Known-outdated coordinates with their cutoff versions pre-parsed into int
+# tuples at import, so the hot path compares tuples directly.
+_OUTDATED_MAVEN: Dict[str, Tuple[int, ...]] = {
+    "junit:junit": (4, 13, 2),
+    "log4j:log4j": (1, 2, 17),
+    "javax.servlet:javax.servlet-api": (4, 0, 1),
+    "org.springframework:spring-core": (4, 3, 30),
+    "commons-collections:commons-collections": (3, 2, 2),
+}
+
+
+@lru_cache(maxsize=1024)
+def _parse_version(version: str) -> Optional[Tuple[int, ...]]:
+    """First three dotted components as an int tuple; None when unparseable."""
+    try:
+        return tuple(map(int, version.split(".")[:3]))
+    except (ValueError, AttributeError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _is_outdated_maven_dependency(group_id: str, artifact_id: str, version: str) -> bool:
+    """True when the coordinate is pinned at or below a known-outdated version.
+
+    Cached on the full coordinate: big multi-module repos repeat the same
+    dependencies across poms, so hits skip the parse entirely.
+    """
+    pinned = _OUTDATED_MAVEN.get(f"{group_id}:{artifact_id}")
+    if pinned is None:
+        return False
+    parsed = _parse_version(version)
+    return parsed is not None and parsed <= pinned
+
+
+def _collect_files(repo_path: str) -> Dict[str, List[str]]:
+    """Classify every relevant file in one directory walk.
+
+    A single traversal replaces the per-analyzer rglob() scans; each analyzer
+    receives the prebuilt bucket it needs, so the tree is statted exactly
+    once per analysis.  The walk is an explicit scandir stack: DirEntry
+    answers is_dir/is_file from the readdir data without extra stat calls,
+    and entry.path strings go straight into the buckets with no Path
+    allocation per file.
+    """
+    buckets: Dict[str, List[str]] = {"java": [], "tests": [], "pom": [], "gradle": []}
+    stack = [repo_path]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name[:1] != "." and name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    if name.endswith(".java"):
+                        buckets["java"].append(entry.path)
+                        if _TEST_FN.match(name):
+                            buckets["tests"].append(entry.path)
+                    elif name == "pom.xml":
+                        buckets["pom"].append(entry.path)
+                    elif name == "build.gradle" or name == "build.gradle.kts":
+                        buckets["gradle"].append(entry.path)
+    return buckets
+
+
+class RepositoryAnalyzer:
+    """Analyzes a local repository checkout for migration readiness."""
+
+    async def analyze_repository(self, repo_path: str) -> Dict[str, Any]:
+        """Run every analyzer over the repository and merge their reports."""
+        files = _collect_files(repo_path)
+        cache_key = (repo_path, _repo_fingerprint(repo_path, files))
+        cached = _ANALYSIS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        analysis = {
+            "repo_path": repo_path,
+            "timestamp": str(os.stat(repo_path).st_mtime),
+        }
+        # The four analyzers are independent and do their file work on
+        # executors, so running them under one gather overlaps their I/O.
+        (
+            analysis["dependencies"],
+            analysis["business_logic"],
+            analysis["testing"],
+            analysis["code_refactoring"],
+        ) = await asyncio.gather(
+            self._analyze_dependencies(repo_path, files),
+            self._analyze_business_logic(repo_path, files),
+            self._analyze_testing(repo_path, files),
+            self._analyze_code_refactoring(repo_path, files),
+        )
+
+        if len(_ANALYSIS_CACHE) >= _ANALYSIS_CACHE_MAX:
+            _ANALYSIS_CACHE.pop(next(iter(_ANALYSIS_CACHE)))
+        _ANALYSIS_CACHE[cache_key] = analysis
+        return analysis
+
+    async def _analyze_dependencies(
+        self, repo_path: str, files: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """Parse build files and flag outdated dependencies."""
+        result = {
+            "build_tool": None,
+            "java_version": None,
+            "dependencies": [],
+            "outdated": [],
+        }
+
+        if files["pom"]:
+            result["build_tool"] = "maven"
+            pom = self._parse_maven_pom(files["pom"][0])
+            result["java_version"] = pom.get("java_version")
+            result["dependencies"] = pom.get("dependencies", [])
+        elif files["gradle"]:
+            result["build_tool"] = "gradle"
+            gradle = self._parse_gradle_build(files["gradle"][0])
+            result["java_version"] = gradle.get("java_version")
+            result["dependencies"] = gradle.get("dependencies", [])
+
+        for dep in result["dependencies"]:
+            if _is_outdated_maven_dependency(
+                dep.get("group_id", ""),
+                dep.get("artifact_id", ""),
+                dep.get("version", ""),
+            ):
+                result["outdated"].append(dep)
+
+        return result
+
+    def _parse_maven_pom(self, pom_path: str) -> Dict[str, Any]:
+        """Extract dependencies, plugins and the Java version from a pom.xml.
+
+        A single streaming iterparse pass (C-accelerated in CPython) replaces
+        the full-tree parse plus repeated ``.//`` XPath scans; each element is
+        cleared once handled, so memory stays flat even for poms with hundreds
+        of dependencies.
+        """
+        parsed: Dict[str, Any] = {"dependencies": [], "plugins": [], "java_version": None}
+        source_version = None
+        try:
+            for _event, elem in ET.iterparse(pom_path, events=("end",)):
+                tag = elem.tag.rpartition("}")[2]
+                if tag == "dependency":
+                    dep = {"group_id": "", "artifact_id": "", "version": ""}
+                    for child in elem:
+                        ctag = child.tag.rpartition("}")[2]
+                        if ctag == "groupId":
+                            dep["group_id"] = child.text or ""
+                        elif ctag == "artifactId":
+                            dep["artifact_id"] = child.text or ""
+                        elif ctag == "version":
+                            dep["version"] = child.text or ""
+                    parsed["dependencies"].append(dep)
+                    elem.clear()
+                elif tag == "plugin":
+                    for child in elem:
+                        if child.tag.rpartition("}")[2] == "artifactId":
+                            parsed["plugins"].append(child.text)
+                            break
+                    elem.clear()
+                elif tag == "properties":
+                    for child in elem:
+                        ctag = child.tag.rpartition("}")[2]
+                        if ctag in ("java.version", "maven.compiler.source"):
+                            parsed["java_version"] = child.text
+                    elem.clear()
+                elif tag == "source":
+                    source_version = elem.text
+        except (ET.ParseError, OSError) as exc:
+            logger.warning("Failed to parse %s: %s", pom_path, exc)
+        if parsed["java_version"] is None:
+            parsed["java_version"] = source_version
+        return parsed
+
+    def _parse_gradle_build(self, gradle_path: str) -> Dict[str, Any]:
+        """Extract dependencies and the Java version from a build.gradle."""
+        parsed: Dict[str, Any] = {"dependencies": [], "java_version": None}
+        try:
+            with open(gradle_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+        except OSError:
+            return parsed
+
+        version_match = _RE_GRADLE_JAVA_VERSION.search(content)
+        if version_match:
+            parsed["java_version"] = version_match.group(1)
+
+        for match in _RE_GRADLE_DEP.finditer(content):
+            parsed["dependencies"].append(
+                {
+                    "group_id": match.group(1),
+                    "artifact_id": match.group(2),
+                    "version": match.group(3),
+                }
+            )
+        return parsed
+
+    async def _analyze_business_logic(
+        self, repo_path: str, files: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """Scan Java sources for common business-logic smells."""
+        # Files are independent, so fan the scans out over a pool and merge;
+        # the event loop stays free while the workers grind through the tree.
+        # Relative paths are a constant-offset slice off the walk's absolute
+        # strings -- str.replace would rescan the path and misfire if the
+        # repo path recurred inside a filename.
+        prefix_len = len(repo_path.rstrip(os.sep)) + 1
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as pool:
+            per_file = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool, _scan_business_logic_file, java_file, prefix_len
+                    )
+                    for java_file in islice(files["java"], 50)
+                )
+            )
+
+        issues: List[Dict[str, Any]] = []
+        for hits in per_file:
+            for hit in hits:
+                hit["severity"], hit["suggestion"] = _BL_META[hit["type"]]
+                issues.append(hit)
+
+        # Only the top 20 are reported; a bounded heap selection is
+        # O(N log 20) where the full sort was O(N log N).
+        top_issues = heapq.nsmallest(
+            20, issues, key=lambda x: _SEVERITY_ORDER.get(x["severity"], 3)
+        )
+        return {"total_issues": len(issues), "issues": top_issues}
+
+    async def _analyze_testing(
+        self, repo_path: str, files: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """Detect test frameworks and estimate test coverage breadth."""
+        test_files = files["tests"]
+        frameworks = set()
+
+        for test_file in islice(test_files, 20):
+            try:
+                with open(test_file, "r", encoding="utf-8", errors="ignore") as f:
+                    content = f.read()
+            except OSError:
+                continue
+            if _FRAMEWORK_AUTOMATON is not None:
+                for _end, name in _FRAMEWORK_AUTOMATON.iter(content):
+                    frameworks.add(name)
+                    if len(frameworks) == len(_FRAMEWORK_LITERALS):
+                        break
+            else:
+                # "in" is a C-level substring scan, several times faster than
+                # running a regex over the same file.
+                for literal, name in _FRAMEWORK_LITERALS:
+                    if name not in frameworks and literal in content:
+                        frameworks.add(name)
+
+        # The shared walk already collected every .java file; counting the
+        # bucket replaces what used to be a second full tree traversal.
+        total_java = len(files["java"])
+        ratio = len(test_files) / total_java if total_java else 0.0
+        return {
+            "test_files": len(test_files),
+            "frameworks": sorted(frameworks),
+            "test_ratio": round(ratio, 3),
+        }
+
+    async def _analyze_code_refactoring(
+        self, repo_path: str, files: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """Flag deprecated API usage, god classes and overlong methods."""
+        prefix_len = len(repo_path.rstrip(os.sep)) + 1
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as pool:
+            per_file = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool, _scan_refactoring_file, java_file, prefix_len
+                    )
+                    for java_file in islice(files["java"], 100)
+                )
+            )
+
+        issues: List[Dict[str, Any]] = [issue for hits in per_file for issue in hits]
+        return {"total_issues": len(issues), "issues": issues[:20]}
@@ -0,0 +1,758 @@
+"""SonarCloud / SonarQube integration.
+
+Triggers a Maven Sonar scan for a migrated project and fetches the resulting
+quality measures (bugs, vulnerabilities, smells, coverage).  When no token is
+configured or the API is unreachable, falls back to simulated results derived
+from the local checkout so the dashboard always has something to show.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import random
+import time
+from collections import deque
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import diskcache
+except ImportError:  # pragma: no cover - optional; in-memory fallback below
+    diskcache = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - optional accelerator
+    lxml_etree = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=512)
+def _candidate_keys(project_key: str, sonar_org: str) -> tuple:
+    """Deduplicated component-key variants SonarCloud may know a project by.
+
+    Pure in its inputs, so the list building and dedup run once per
+    (key, org) pair instead of on every fetch.
+    """
+    candidates = [project_key]
+    if sonar_org:
+        candidates.append(f"{sonar_org}_{project_key}")
+        candidates.append(f"{sonar_org}:{project_key}")
+    candidates.append(project_key.replace("-", "_"))
+    candidates.append(project_key.lower())
+    return tuple(dict.fromkeys(candidates))
+
+
+def _json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, via orjson when available.
+
+    orjson parses the raw bytes directly, skipping the charset sniffing and
+    str round-trip httpx's .json() performs on every call.
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Repeat UI polls and retries for the same project land within seconds of
+# each other; a short TTL in front of the API makes them near-free without
+# serving stale data for long.
+_RESULT_TTL = 120.0
+
+# Resolved component keys are stable for a given (org, key) but projects do
+# occasionally get re-keyed; an hour-long TTL bounds how long a rename can be
+# shadowed by the memo.
+_KEY_TTL = 3600.0
+# Quality-gate status changes only when an analysis completes; 30s keeps
+# dashboard polling off the server without going visibly stale.
+_GATE_TTL = 30.0
+
+
+_RATING_LETTERS = {1: "A", 2: "B", 3: "C", 4: "D", 5: "E"}
+
+
+def _rating_letter(v) -> str:
+    """Sonar rating measure ("1.0".."5.0") as its letter grade."""
+    try:
+        return _RATING_LETTERS.get(int(float(v)), "N/A")
+    except (TypeError, ValueError):
+        return "N/A"
+
+
+def _to_int(v) -> int:
+    """Measure value as int; measures arrive as strings, usually plain digits."""
+    if isinstance(v, str) and v.isdigit():
+        return int(v)
+    try:
+        return int(float(v))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_float(v) -> float:
+    """Measure value as float; 0.0 for anything malformed or missing."""
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _MemoryCache:
+    """Minimal get/set(expire=) stand-in when diskcache is not installed."""
+
+    def __init__(self):
+        self._entries: Dict[Any, Any] = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, deadline = entry
+        if time.monotonic() >= deadline:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key, value, expire):
+        self._entries[key] = (value, time.monotonic() + expire)
+
+
+class SonarQubeService:
+    """Runs Sonar scans and reads analysis results from the SonarCloud API."""
+
+    _METRIC_KEYS = (
+        "bugs,vulnerabilities,code_smells,security_hotspots,"
+        "coverage,duplicated_lines_density,alert_status,"
+        "reliability_rating,security_rating,sqale_rating"
+    )
+    _MEASURES_PATH = "/api/measures/component"
+    _GATE_PATH = "/api/qualitygates/project_status"
+    _CE_PATH = "/api/ce/component"
+    _COMPONENTS_PATH = "/api/components/show"
+    _ISSUES_PATH = "/api/issues/search"
+    _HOTSPOTS_PATH = "/api/hotspots/search"
+
+    # Per-endpoint deadlines: measures aggregates server-side and is worth
+    # waiting out, while the cheap status probes should fail fast so the
+    # polling loop and speculative fallbacks stay responsive.  connect stays
+    # at 3s across the board; endpoints not listed use the client default.
+    _TIMEOUTS = {
+        _MEASURES_PATH: httpx.Timeout(15.0, connect=3.0),
+        _COMPONENTS_PATH: httpx.Timeout(10.0, connect=3.0),
+        _ISSUES_PATH: httpx.Timeout(10.0, connect=3.0),
+        _GATE_PATH: httpx.Timeout(5.0, connect=3.0),
+        _CE_PATH: httpx.Timeout(5.0, connect=3.0),
+        _HOTSPOTS_PATH: httpx.Timeout(10.0, connect=3.0),
+    }
+
+    def __init__(self):
+        self.sonar_url = os.getenv("SONAR_URL", "https://sonarcloud.io")
+        self.sonar_token = os.getenv("SONAR_TOKEN", "")
+        self.sonar_org = os.getenv("SONAR_ORG", "")
+        # Built once as a BasicAuth instance so the header is encoded a
+        # single time instead of per request.
+        self._auth = httpx.BasicAuth(self.sonar_token, "") if self.sonar_token else None
+        self._client: Optional[httpx.AsyncClient] = None
+        if diskcache is not None:
+            self._result_cache = diskcache.Cache(
+                os.getenv("SONAR_CACHE_DIR", "/tmp/sonar_cache")
+            )
+        else:
+            self._result_cache = _MemoryCache()
+        # (sonar_org, project_key) -> (resolved component key, stored-at);
+        # one successful probe round serves every later call within the TTL.
+        self._resolved_keys: Dict[Any, Any] = {}
+        self._resolve_lock = asyncio.Lock()
+        # In-flight analyses by project key; concurrent callers for the same
+        # key await the first run instead of spawning duplicate scans.
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # project_path -> (root mtime, java-file count) for the fallback.
+        self._gate_cache: Dict[str, Any] = {}
+        self._java_count_cache: Dict[str, Any] = {}
+        # project_path -> (jacoco mtime, simulated result dict).
+        self._sim_cache: Dict[str, Any] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared pooled client, created on first use.
+
+        One client for the service's lifetime keeps connections alive across
+        calls, so repeat requests skip the TCP+TLS handshake entirely -- the
+        old per-call ``async with httpx.AsyncClient()`` blocks paid it every
+        time, several times per analysis when probing key candidates.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                # base_url lets call sites pass bare API paths and spares
+                # httpx a full URL parse per request.
+                base_url=self.sonar_url,
+                # Credentials ride on the client; anonymous fallback requests
+                # override with an explicit auth=None.
+                auth=self._auth,
+                # An explicit transport makes httpx ignore client-level
+                # http2=/limits=, so they live on the transport itself.
+                # SonarCloud speaks HTTP/2, so the concurrent probe/measure
+                # gathers multiplex over one TLS connection instead of
+                # opening a socket each; connect-level retries absorb resets
+                # below the application retry loop.  SONAR_HTTP2=0 drops
+                # back to HTTP/1.1 for self-hosted servers behind proxies
+                # that mishandle h2.
+                transport=httpx.AsyncHTTPTransport(
+                    retries=3,
+                    http2=os.getenv("SONAR_HTTP2", "1") != "0",
+                    limits=httpx.Limits(
+                        max_keepalive_connections=20, max_connections=100
+                    ),
+                ),
+                timeout=httpx.Timeout(10.0, connect=3.0),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client (wired to app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def analyze_project(self, project_path: str, project_key: str) -> Dict[str, Any]:
+        """Run a Sonar scan over a local project and return its measures.
+
+        Concurrent calls for the same project key coalesce onto one in-flight
+        run -- UI polls and migration steps otherwise each spawn their own
+        Maven scan and API fetches for identical work.
+        """
+        existing = self._inflight.get(project_key)
+        if existing is not None:
+            return await existing
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[project_key] = fut
+        try:
+            result = await self._analyze_project(project_path, project_key)
+        except BaseException as exc:
+            fut.set_exception(exc)
+            # Mark the exception retrieved: with no concurrent waiter (the
+            # common case) nobody ever awaits fut, and asyncio would log
+            # "Future exception was never retrieved" at GC time.
+            fut.exception()
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            del self._inflight[project_key]
+
+    async def _analyze_project(self, project_path: str, project_key: str) -> Dict[str, Any]:
+        """The real analysis body behind the coalescing wrapper."""
+        pom_path = os.path.join(project_path, "pom.xml")
+        scanner_ran = False
+
+        if await asyncio.to_thread(os.path.exists, pom_path) and self.sonar_token:
+            sonar_args = [
+                "mvn",
+                # One Maven thread per core; the reactor modules build
+                # independently and the scanner tolerates parallel builds.
+                "-T",
+                "1C",
+                "sonar:sonar",
+                f"-Dsonar.projectKey={project_key}",
+                f"-Dsonar.host.url={self.sonar_url}",
+                f"-Dsonar.login={self.sonar_token}",
+                "-Dsonar.analysisCache.enabled=true",
+            ]
+            if os.getenv("SONAR_SKIP_TESTS") == "1":
+                # Pipelines that already ran the test phase can skip the rerun.
+                sonar_args.append("-DskipTests")
+            if self.sonar_org:
+                sonar_args.append(f"-Dsonar.organization={self.sonar_org}")
+
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *sonar_args,
+                    cwd=project_path,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                )
+                # Drain the scanner output line by line, keeping only a tail
+                # for error reporting; communicate() buffered the entire
+                # Maven log (easily hundreds of MB) in memory just in case.
+                tail = deque(maxlen=200)
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
+                async for line in process.stdout:
+                    tail.append(line)
+                    if debug_enabled:
+                        logger.debug("sonar-scanner: %s", line.rstrip())
+                await process.wait()
+                if process.returncode != 0:
+                    logger.error(
+                        "Sonar scan failed: %s",
+                        b"".join(tail).decode(errors="ignore"),
+                    )
+                else:
+                    scanner_ran = True
+            except Exception:
+                logger.exception("Failed to launch sonar scanner")
+
+        # Only wait for server-side processing when a scan was actually
+        # submitted, and stop as soon as the compute-engine task finishes;
+        # the old unconditional 5s sleep taxed even the no-op paths.  Full
+        # jitter on the backoff keeps a fleet of workers from polling the CE
+        # API in lockstep.
+        if scanner_ran:
+            for attempt in range(5):
+                await asyncio.sleep(random.uniform(0, min(8.0, 0.5 * (2 ** attempt))))
+                if await self._analysis_ready(project_key):
+                    break
+
+        results = await self._fetch_analysis_results(project_key)
+        if results is not None:
+            return results
+        # The fallback walks the tree and parses XML synchronously; run it on
+        # the default executor so concurrent analyses in the same worker keep
+        # making progress.
+        return await asyncio.to_thread(self._get_simulated_results, project_path)
+
+    async def _sonar_get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET with credentials, falling back to anonymous access once.
+
+        Routing every Sonar read through here replaces the old duplicated
+        authenticated/anonymous code paths -- which also only fell back when
+        the whole authenticated block *raised*, so a clean 401/403 response
+        never triggered the public-project fallback at all.
+        """
+        client = self._get_client()
+        timeout = self._TIMEOUTS.get(url, client.timeout)
+        # A transient 5xx or connection reset used to degrade the whole
+        # request to simulated results; a few short retries ride out the
+        # blip instead.  tenacity would be a new dependency for what the
+        # rate_limiter module already does by hand, so this follows suit.
+        # Full jitter (uniform over the exponential window) rather than a
+        # fixed schedule, so concurrent callers retrying the same outage
+        # do not hammer the server in lockstep.
+        last_exc = None
+        retry_after = None
+        for attempt in range(4):
+            if attempt:
+                delay = random.uniform(0.0, min(20.0, 0.5 * (2 ** attempt)))
+                if retry_after is not None:
+                    # The server told us when the throttle lifts; honor it.
+                    delay = max(delay, retry_after)
+                    retry_after = None
+                logger.warning(
+                    "Retrying Sonar GET %s in %.1fs (attempt %d/4)",
+                    url,
+                    delay,
+                    attempt + 1,
+                )
+                await asyncio.sleep(delay)
+            try:
+                response = await client.get(url, params=params, timeout=timeout)
+            except httpx.TransportError as exc:
+                last_exc = exc
+                continue
+            # The server answered, so any earlier transport error is stale;
+            # if the retries run out now, the response is what callers get.
+            last_exc = None
+            if response.status_code in (429, 502, 503, 504):
+                try:
+                    retry_after = float(response.headers.get("Retry-After", ""))
+                except ValueError:
+                    retry_after = None
+                continue
+            if self._auth is not None and response.status_code in (401, 403):
+                response = await client.get(url, params=params, auth=None, timeout=timeout)
+            return response
+        if last_exc is not None:
+            raise last_exc
+        return response
+
+    async def _analysis_ready(self, project_key: str) -> bool:
+        """True once the background compute-engine task for the key succeeded."""
+        try:
+            response = await self._sonar_get(
+                self._CE_PATH,
+                params={"component": project_key},
+            )
+            if response.status_code != 200:
+                return False
+            current = _json(response).get("current") or {}
+            return current.get("status") == "SUCCESS"
+        except Exception:
+            return False
+
+    def _get_resolved_key(self, memo_key) -> Optional[str]:
+        """Memoized component key for (org, project_key), honoring the TTL."""
+        entry = self._resolved_keys.get(memo_key)
+        if entry is None:
+            return None
+        resolved_key, stored_at = entry
+        if time.monotonic() - stored_at >= _KEY_TTL:
+            del self._resolved_keys[memo_key]
+            return None
+        return resolved_key
+
+    async def _resolve_component(self, uniq_candidates) -> Optional[str]:
+        """Resolve which candidate key SonarCloud actually knows.
+
+        The probes are independent, so firing them together collapses up to
+        five serial round-trips into one; responses are then inspected in the
+        original priority order so resolution stays deterministic.  Probes
+        hit the components endpoint, which only establishes existence and
+        returns a far smaller body than a measures query.
+        """
+        responses = await asyncio.gather(
+            *(
+                self._sonar_get(self._COMPONENTS_PATH, params={"component": comp})
+                for comp in uniq_candidates
+            ),
+            return_exceptions=True,
+        )
+        for comp, r in zip(uniq_candidates, responses):
+            if isinstance(r, Exception) or r.status_code != 200:
+                continue
+            # Decode once into a local, and treat a non-JSON body as a
+            # miss rather than letting it abort the whole resolution round.
+            try:
+                payload = _json(r)
+            except ValueError:
+                continue
+            if payload.get("component"):
+                return comp
+        return None
+
+    async def _fetch_analysis_results(self, project_key: str) -> Optional[Dict[str, Any]]:
+        """Fetch measures for a project, probing the key variants SonarCloud may use."""
+        cache_key = (self.sonar_url, project_key)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        uniq_candidates = _candidate_keys(project_key, self.sonar_org or "")
+
+        try:
+            memo_key = (self.sonar_org, project_key)
+            resolved_key = self._get_resolved_key(memo_key)
+            if resolved_key is None:
+                # The lock coalesces concurrent first calls so only one of
+                # them pays for the probe round.
+                async with self._resolve_lock:
+                    resolved_key = self._get_resolved_key(memo_key)
+                    if resolved_key is None:
+                        resolved_key = await self._resolve_component(uniq_candidates)
+                        if resolved_key is not None:
+                            self._resolved_keys[memo_key] = (
+                                resolved_key,
+                                time.monotonic(),
+                            )
+            if resolved_key is None:
+                return None
+
+            result = await self._parse_measures(resolved_key)
+            self._result_cache.set(cache_key, result, expire=_RESULT_TTL)
+            return result
+        except Exception:
+            logger.exception("Failed to fetch sonar results for %s", project_key)
+            return None
+
+    async def _parse_measures(self, resolved_key: str) -> Dict[str, Any]:
+        """Fetch and shape the measure set for a resolved component key.
+
+        Historically this logic was duplicated wholesale for the anonymous
+        retry; _sonar_get owns the auth fallback now, so one copy serves
+        both paths.
+        """
+        # Launch the fallback lookups speculatively alongside the measures
+        # request: cold analyses need several of them, and starting them all
+        # in the same round-trip window collapses the serial await chain.
+        # Whatever the measures response makes redundant is cancelled.
+        measures_task = asyncio.ensure_future(
+            self._sonar_get(
+                self._MEASURES_PATH,
+                params={
+                    "component": resolved_key,
+                    "metricKeys": self._METRIC_KEYS,
+                },
+            )
+        )
+        issues_task = asyncio.ensure_future(self._count_issues_by_type(resolved_key))
+        hotspots_task = asyncio.ensure_future(self._count_hotspots(resolved_key))
+        gate_task = asyncio.ensure_future(self.get_quality_gate_status(resolved_key))
+        speculative = (issues_task, hotspots_task, gate_task)
+
+        try:
+            return await self._shape_measures(
+                resolved_key, measures_task, issues_task, hotspots_task, gate_task
+            )
+        finally:
+            # Whatever the shaping didn't consume -- because a measure made
+            # it redundant or because shaping itself raised -- gets cancelled
+            # and reaped here; an abandoned task would otherwise surface as
+            # "exception was never retrieved" noise at GC time.
+            for task in speculative:
+                task.cancel()
+            await asyncio.gather(*speculative, return_exceptions=True)
+
+    async def _shape_measures(
+        self,
+        resolved_key: str,
+        measures_task: "asyncio.Future",
+        issues_task: "asyncio.Future",
+        hotspots_task: "asyncio.Future",
+        gate_task: "asyncio.Future",
+    ) -> Dict[str, Any]:
+        """Shape the result dict, awaiting only the fallbacks it needs."""
+        response = await measures_task
+        data = _json(response)
+        # Skip entries with no value rather than defaulting them to "0";
+        # the fallback gating below depends on absence staying absent.
+        measures = {}
+        for measure in data.get("component", {}).get("measures", []):
+            if "value" in measure:
+                measures[measure["metric"]] = measure["value"]
+
+        # A metric key missing from the response means Sonar computed no
+        # value for it -- a genuine zero still arrives as "0" -- so only
+        # absence justifies the issues-search fallback.  One facets query
+        # covers every missing type at once.
+        if (
+            "bugs" in measures
+            and "vulnerabilities" in measures
+            and "code_smells" in measures
+        ):
+            issues_task.cancel()
+            issue_counts: Dict[str, int] = {}
+        else:
+            issue_counts = await issues_task
+        if "bugs" in measures:
+            bugs = _to_int(measures["bugs"])
+        else:
+            bugs = issue_counts.get("BUG", 0)
+        if "vulnerabilities" in measures:
+            vulnerabilities = _to_int(measures["vulnerabilities"])
+        else:
+            vulnerabilities = issue_counts.get("VULNERABILITY", 0)
+        if "code_smells" in measures:
+            code_smells = _to_int(measures["code_smells"])
+        else:
+            code_smells = issue_counts.get("CODE_SMELL", 0)
+        # The gate status ships as the alert_status metric, so the dedicated
+        # /api/qualitygates result is only consumed when the metric is
+        # missing.
+        quality_gate = measures.get("alert_status")
+        if quality_gate is None:
+            quality_gate = await gate_task
+        else:
+            gate_task.cancel()
+
+        if "security_hotspots" in measures:
+            hotspots_task.cancel()
+            security_hotspots = _to_int(measures["security_hotspots"])
+        else:
+            security_hotspots = await hotspots_task
+
+        result = {
+            "project_key": resolved_key,
+            "bugs": bugs,
+            "vulnerabilities": vulnerabilities,
+            "code_smells": code_smells,
+            "security_hotspots": security_hotspots,
+            "coverage": _to_float(measures.get("coverage")),
+            "duplications": _to_float(measures.get("duplicated_lines_density")),
+            "reliability_rating": _rating_letter(measures.get("reliability_rating")),
+            "security_rating": _rating_letter(measures.get("security_rating")),
+            "maintainability_rating": _rating_letter(measures.get("sqale_rating")),
+            "quality_gate": quality_gate,
+            "dashboard_url": f"{self.sonar_url}/dashboard?id={resolved_key}",
+            "simulated": False,
+        }
+        return result
+
+    async def _count_issues_by_type(self, project_key: str) -> Dict[str, int]:
+        """Per-type unresolved issue totals from a single facets query.
+
+        The types facet carries every per-type total in one one-item page,
+        where the per-type searches cost a round-trip each.
+        """
+        response = await self._sonar_get(
+            self._ISSUES_PATH,
+            params={
+                "componentKeys": project_key,
+                "types": "BUG,VULNERABILITY,CODE_SMELL",
+                "resolved": "false",
+                "ps": 1,
+                "facets": "types",
+            },
+        )
+        if response.status_code != 200:
+            return {}
+        counts: Dict[str, int] = {}
+        for facet in _json(response).get("facets", []):
+            if facet.get("property") == "types":
+                for value in facet.get("values", []):
+                    counts[value.get("val")] = _to_int(value.get("count"))
+                break
+        return counts
+
+    async def _count_hotspots(self, project_key: str) -> int:
+        """Security-hotspot total, via a one-item page."""
+        response = await self._sonar_get(
+            self._HOTSPOTS_PATH,
+            params={"projectKey": project_key, "ps": 1},
+        )
+        if response.status_code != 200:
+            return 0
+        return _to_int(_json(response).get("paging", {}).get("total"))
+
+    async def get_quality_gate_status(self, project_key: str) -> str:
+        """Project quality-gate status ("OK", "ERROR" or "NONE").
+
+        Cached for a short window: dashboards poll this per render, and the
+        gate only flips when a new analysis lands.
+        """
+        cached = self._gate_cache.get(project_key)
+        if cached is not None:
+            status, stored_at = cached
+            if time.monotonic() - stored_at < _GATE_TTL:
+                return status
+        status = "NONE"
+        try:
+            response = await self._sonar_get(
+                self._GATE_PATH,
+                params={"projectKey": project_key},
+            )
+            if response.status_code == 200:
+                status = (
+                    _json(response)
+                    .get("projectStatus", {})
+                    .get("status", "NONE")
+                )
+        except Exception:
+            logger.exception("Failed to fetch quality gate for %s", project_key)
+        self._gate_cache[project_key] = (status, time.monotonic())
+        return status
+
+    def _count_java_files(self, project_path: str, cap: int = 500) -> int:
+        """Java-file count for the simulated heuristics, capped and memoized.
+
+        scandir answers is-dir/is-file from the directory read itself, so the
+        count costs one syscall per directory instead of os.walk's
+        stat-per-entry plus filename-list materialization.  The count only
+        feeds rough heuristic formulas, so the walk stops at the cap rather
+        than touching every entry of a 10k-file tree, and the result is
+        remembered per root mtime since fallbacks tend to repeat.
+        """
+        try:
+            root_mtime = os.stat(project_path).st_mtime_ns
+        except OSError:
+            root_mtime = None
+        cached = self._java_count_cache.get(project_path)
+        if cached is not None and cached[0] == root_mtime:
+            return cached[1]
+
+        count = 0
+        stack = [project_path]
+        while stack and count < cap:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        if entry.name.endswith(".java"):
+                            count += 1
+                            if count >= cap:
+                                break
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+
+        self._java_count_cache[project_path] = (root_mtime, count)
+        return count
+
+    def _get_simulated_results(self, project_path: str) -> Dict[str, Any]:
+        """Best-effort local estimate when the SonarCloud API is unavailable."""
+        jacoco_path = os.path.join(
+            project_path, "target", "site", "jacoco", "jacoco.xml"
+        )
+        try:
+            jacoco_mtime = os.stat(jacoco_path).st_mtime_ns
+        except OSError:
+            jacoco_mtime = 0
+
+        # Fallbacks repeat within a flow and nothing they read changed unless
+        # the coverage report did; key the memo on its mtime.
+        cached = self._sim_cache.get(project_path)
+        if cached is not None and cached[0] == jacoco_mtime:
+            return cached[1]
+
+        java_files = self._count_java_files(project_path)
+
+        coverage = 0.0
+        if jacoco_mtime:
+            # Multi-module JaCoCo reports run to tens of MB; stream the XML
+            # and stop at the report-level LINE counter.  Method and class
+            # counters come first in document order, so the parse must look
+            # at the counter's position, not just its type: only a counter
+            # whose parent is the <report> root carries the project total.
+            try:
+                if lxml_etree is not None:
+                    for _event, elem in lxml_etree.iterparse(
+                        jacoco_path, events=("end",), tag="counter"
+                    ):
+                        if (
+                            elem.get("type") == "LINE"
+                            and elem.getparent().tag == "report"
+                        ):
+                            missed = int(elem.get("missed", 0))
+                            covered = int(elem.get("covered", 0))
+                            total = missed + covered
+                            coverage = (covered / total * 100) if total else 0.0
+                            break
+                        elem.clear()
+                else:
+                    # Stdlib ElementTree has no parent pointers; track depth
+                    # via paired start/end events instead, and clear handled
+                    # elements so memory stays flat on big reports.
+                    depth = 0
+                    for event, elem in ET.iterparse(
+                        jacoco_path, events=("start", "end")
+                    ):
+                        if event == "start":
+                            depth += 1
+                            continue
+                        depth -= 1
+                        if (
+                            depth == 1
+                            and elem.tag == "counter"
+                            and elem.get("type") == "LINE"
+                        ):
+                            missed = int(elem.get("missed", 0))
+                            covered = int(elem.get("covered", 0))
+                            total = missed + covered
+                            coverage = (covered / total * 100) if total else 0.0
+                            break
+                        elem.clear()
+            except Exception:
+                logger.exception("Failed to parse jacoco report %s", jacoco_path)
+
+        result = {
+            "project_key": None,
+            "bugs": max(0, java_files // 20),
+            "vulnerabilities": max(0, java_files // 50),
+            "code_smells": java_files * 2,
+            "security_hotspots": max(0, java_files // 40),
+            "coverage": round(coverage, 1),
+            "duplications": round(min(25.0, java_files * 0.05), 1),
+            "quality_gate": "NONE",
+            "dashboard_url": None,
+            "simulated": True,
+        }
+        self._sim_cache[project_path] = (jacoco_mtime, result)
+        return result
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Quick sanity check for Java version detection against a mock repo."""
+
+import asyncio
+import importlib
+import os
+import sys
+
+# Guarded insert: appending unconditionally let duplicate entries pile up
+# across embedders and re-runs, lengthening every import's finder walk.
+# Invalidate once so the finders pick the new directory up immediately.
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+if BACKEND not in sys.path:
+    sys.path.insert(0, BACKEND)
+    importlib.invalidate_caches()
+
+from tests._mock_github import (  # noqa: E402
+    HELLO_WORLD_JAVA_1_0,
+    MockRepository,
+    shared_service,
+)
+
+
+async def test_simple():
+    test_files = [
+        {"name": "HelloWorld.java", "content": HELLO_WORLD_JAVA_1_0},
+    ]
+    mock_repo = MockRepository(test_files)
+    service = shared_service()
+    detected = await service._detect_java_version_from_repo(mock_repo)
+    print(f"Detected Java version: {detected}")
+    if detected == "1.0":
+        print("PASS: Java 1.0 detected from header comment")
+    else:
+        print(f"FAIL: expected 1.0, got {detected}")
+    # One listing plus one file read: the detector must stop at the first
+    # conclusive file rather than scanning the whole repo.
+    if mock_repo.reads <= 2:
+        print(f"PASS: detector stopped after {mock_repo.reads} reads")
+    else:
+        print(f"FAIL: detector made {mock_repo.reads} reads")
+
+
+# libuv's event loop cuts per-task scheduling overhead; absent (e.g. on
+# Windows) the stdlib selector loop is used unchanged.
+try:
+    import uvloop
+
+    _run = uvloop.run
+except ImportError:  # pragma: no cover - optional accelerator
+    _run = asyncio.run
+
+if __name__ == "__main__":
+    _run(test_simple())